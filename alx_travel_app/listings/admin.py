@@ -9,6 +9,7 @@ class ListingAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description', 'city', 'country', 'address']
     readonly_fields = ['created_at', 'updated_at']
     raw_id_fields = ['host']
+    list_select_related = ['host']
 
 
 @admin.register(Booking)
@@ -18,6 +19,7 @@ class BookingAdmin(admin.ModelAdmin):
     search_fields = ['listing__title', 'guest__username', 'guest__email']
     readonly_fields = ['created_at', 'updated_at']
     raw_id_fields = ['listing', 'guest']
+    list_select_related = ['listing', 'guest']
     date_hierarchy = 'check_in'
 
 
@@ -28,3 +30,4 @@ class ReviewAdmin(admin.ModelAdmin):
     search_fields = ['listing__title', 'user__username', 'comment']
     readonly_fields = ['created_at', 'updated_at']
     raw_id_fields = ['listing', 'user', 'booking']
+    list_select_related = ['listing', 'user']
@@ -4,13 +4,125 @@ Usage: python manage.py seed [--listings N] [--bookings] [--reviews]
 """
 
 from django.core.management.base import BaseCommand
-from django.contrib.auth.models import User
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
 from decimal import Decimal
 from datetime import timedelta
+from collections import defaultdict
 import random
 
-from listings.models import Listing, Booking, Review
+from ...models import Listing, Booking, Review
+
+User = get_user_model()
+
+# Static sample data, built once at import time rather than per run
+_CITIES = [
+    {'city': 'New York', 'country': 'United States'},
+    {'city': 'London', 'country': 'United Kingdom'},
+    {'city': 'Paris', 'country': 'France'},
+    {'city': 'Tokyo', 'country': 'Japan'},
+    {'city': 'Sydney', 'country': 'Australia'},
+    {'city': 'Dubai', 'country': 'United Arab Emirates'},
+    {'city': 'Barcelona', 'country': 'Spain'},
+    {'city': 'Rome', 'country': 'Italy'},
+    {'city': 'Bangkok', 'country': 'Thailand'},
+    {'city': 'Amsterdam', 'country': 'Netherlands'},
+    {'city': 'Berlin', 'country': 'Germany'},
+    {'city': 'Singapore', 'country': 'Singapore'},
+    {'city': 'Istanbul', 'country': 'Turkey'},
+    {'city': 'Cairo', 'country': 'Egypt'},
+    {'city': 'Cape Town', 'country': 'South Africa'},
+]
+
+_PROPERTY_TYPES = tuple(choice[0] for choice in Listing.PROPERTY_TYPES)
+
+_AMENITIES_POOL = [
+    'WiFi', 'Air Conditioning', 'Heating', 'Kitchen', 'Washer', 'Dryer',
+    'TV', 'Parking', 'Pool', 'Gym', 'Hot Tub', 'Fireplace', 'Balcony',
+    'Garden', 'Beach Access', 'Mountain View', 'City View', 'Elevator',
+    'Security System', 'Pet Friendly', 'Smoking Allowed', 'Wheelchair Accessible'
+]
+
+_TITLES_TEMPLATES = {
+    'apartment': [
+        'Cozy Apartment in {city}',
+        'Modern {city} Apartment',
+        'Stylish Downtown {city} Apartment',
+        'Luxury {city} Apartment',
+        'Spacious {city} Apartment',
+    ],
+    'house': [
+        'Beautiful House in {city}',
+        'Family-Friendly {city} House',
+        'Charming {city} Home',
+        'Elegant {city} House',
+        'Traditional {city} House',
+    ],
+    'hotel': [
+        'Grand {city} Hotel',
+        'Boutique {city} Hotel',
+        'Luxury {city} Hotel',
+        'Central {city} Hotel',
+        'Historic {city} Hotel',
+    ],
+    'villa': [
+        'Luxury Villa in {city}',
+        'Private {city} Villa',
+        'Beachfront {city} Villa',
+        'Modern {city} Villa',
+        'Elegant {city} Villa',
+    ],
+    'cottage': [
+        'Charming Cottage in {city}',
+        'Cozy {city} Cottage',
+        'Rustic {city} Cottage',
+        'Quaint {city} Cottage',
+        'Traditional {city} Cottage',
+    ],
+    'hostel': [
+        'Budget-Friendly {city} Hostel',
+        'Central {city} Hostel',
+        'Modern {city} Hostel',
+        'Social {city} Hostel',
+        'Clean {city} Hostel',
+    ],
+    'resort': [
+        'Luxury {city} Resort',
+        'Beach {city} Resort',
+        'All-Inclusive {city} Resort',
+        'Family {city} Resort',
+        'Boutique {city} Resort',
+    ],
+}
+
+_DESCRIPTIONS = [
+    'A beautiful and well-maintained property perfect for your stay. Located in a prime area with easy access to local attractions.',
+    'Experience comfort and luxury in this stunning property. Fully equipped with modern amenities and excellent service.',
+    'Perfect for families and groups. This spacious property offers everything you need for a memorable vacation.',
+    'Located in the heart of the city, this property provides easy access to restaurants, shops, and cultural sites.',
+    'A peaceful retreat offering tranquility and relaxation. Ideal for those seeking a quiet getaway.',
+    'Modern design meets comfort in this exceptional property. Features top-of-the-line amenities and stunning views.',
+    'Historic charm with modern conveniences. This unique property offers a one-of-a-kind experience.',
+    'Beachfront property with breathtaking ocean views. Perfect for beach lovers and water sports enthusiasts.',
+    'Mountain view property surrounded by nature. Great for hiking, outdoor activities, and nature lovers.',
+    'Urban chic property in the city center. Close to nightlife, dining, and entertainment options.',
+]
+
+_STREET_NAMES = ['Main St', 'Park Ave', 'Broadway', 'Ocean Dr', 'Mountain Rd', 'Garden Ln', 'Sunset Blvd']
+
+# Nightly price range per property type
+_PRICE_RANGES = {
+    'hostel': (15, 50),
+    'apartment': (50, 200),
+    'house': (80, 300),
+    'cottage': (60, 250),
+    'hotel': (100, 400),
+    'villa': (200, 800),
+    'resort': (150, 600),
+}
 
 
 class Command(BaseCommand):
@@ -45,38 +157,98 @@ class Command(BaseCommand):
         create_reviews = options['reviews']
         clear_data = options['clear']
 
-        if clear_data:
-            self.stdout.write(self.style.WARNING('Clearing existing data...'))
+        # One transaction for the whole run so commits are not paid per row
+        with transaction.atomic():
+            if clear_data:
+                self.stdout.write(self.style.WARNING('Clearing existing data...'))
+                self._clear_data()
+                self.stdout.write(self.style.SUCCESS('Existing data cleared.'))
+
+            # Create or get sample users (hosts)
+            hosts = self._create_hosts()
+        
+            # Create listings
+            self.stdout.write(f'Creating {num_listings} listings...')
+            listings = self._create_listings(hosts, num_listings)
+            self.stdout.write(self.style.SUCCESS(f'Successfully created {len(listings)} listings.'))
+
+            # Create bookings if requested
+            if create_bookings:
+                self.stdout.write('Creating sample bookings...')
+                bookings = self._create_bookings(listings, hosts)
+                self.stdout.write(self.style.SUCCESS(f'Successfully created {len(bookings)} bookings.'))
+
+            # Create reviews if requested
+            if create_reviews:
+                self.stdout.write('Creating sample reviews...')
+                reviews = self._create_reviews(listings)
+                self.stdout.write(self.style.SUCCESS(f'Successfully created {len(reviews)} reviews.'))
+
+        self.stdout.write(self.style.SUCCESS('Database seeding completed!'))
+
+    def _clear_data(self):
+        """Remove all reviews, bookings and listings."""
+        if connection.vendor == 'postgresql':
+            # A single TRUNCATE skips Django's row-by-row cascade collection;
+            # CASCADE also empties tables referencing these (e.g. payments).
+            tables = ', '.join(
+                connection.ops.quote_name(model._meta.db_table)
+                for model in (Review, Booking, Listing)
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f'TRUNCATE TABLE {tables} RESTART IDENTITY CASCADE')
+        else:
             Review.objects.all().delete()
             Booking.objects.all().delete()
             Listing.objects.all().delete()
-            self.stdout.write(self.style.SUCCESS('Existing data cleared.'))
 
-        # Create or get sample users (hosts)
-        hosts = self._create_hosts()
-        
-        # Create listings
-        self.stdout.write(f'Creating {num_listings} listings...')
-        listings = self._create_listings(hosts, num_listings)
-        self.stdout.write(self.style.SUCCESS(f'Successfully created {len(listings)} listings.'))
-
-        # Create bookings if requested
-        if create_bookings:
-            self.stdout.write('Creating sample bookings...')
-            bookings = self._create_bookings(listings, hosts)
-            self.stdout.write(self.style.SUCCESS(f'Successfully created {len(bookings)} bookings.'))
-
-        # Create reviews if requested
-        if create_reviews:
-            self.stdout.write('Creating sample reviews...')
-            reviews = self._create_reviews(listings)
-            self.stdout.write(self.style.SUCCESS(f'Successfully created {len(reviews)} reviews.'))
+    def _bulk_create(self, model, objs, only=None, **kwargs):
+        """
+        Insert objs in batches and return them with primary keys set.
 
-        self.stdout.write(self.style.SUCCESS('Database seeding completed!'))
+        Where the rows have to be read back, only limits the columns loaded
+        to the ones later seeding steps use.
+
+        Rows go straight to the database without save(), full_clean() or
+        model signals; the database constraints (check_out_after_check_in,
+        unique_user_listing_review) are what validate seeded data.
+        """
+        batch_size = getattr(settings, 'SEED_BULK_BATCH_SIZE', 500) or 500
+        with transaction.atomic():
+            if connection.features.can_return_rows_from_bulk_insert:
+                return model.objects.bulk_create(objs, batch_size=batch_size, **kwargs)
+            # Backends such as MySQL don't return PKs from bulk inserts,
+            # so read the new rows back instead.
+            last_pk = model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+            model.objects.bulk_create(objs, batch_size=batch_size, **kwargs)
+            queryset = model.objects.filter(pk__gt=last_pk).order_by('pk')
+            if only:
+                queryset = queryset.only(*only)
+            return list(queryset)
+
+    def _get_or_create_users(self, user_data):
+        """
+        Fetch the users named in user_data, bulk-creating any that are missing.
+
+        Returns a (users, created) tuple; users follows the order of user_data.
+        """
+        usernames = [info['username'] for info in user_data]
+        existing = {u.username: u for u in User.objects.filter(username__in=usernames)}
+
+        # Hash once and share it; every seeded user gets the same password
+        password = make_password('password123')
+        new_users = [
+            User(password=password, **info)
+            for info in user_data
+            if info['username'] not in existing
+        ]
+        created = self._bulk_create(User, new_users) if new_users else []
+        existing.update((u.username, u) for u in created)
+
+        return [existing[username] for username in usernames], created
 
     def _create_hosts(self):
         """Create or get sample host users."""
-        hosts = []
         host_data = [
             {'username': 'host1', 'email': 'host1@example.com', 'first_name': 'John', 'last_name': 'Smith'},
             {'username': 'host2', 'email': 'host2@example.com', 'first_name': 'Sarah', 'last_name': 'Johnson'},
@@ -85,144 +257,44 @@ class Command(BaseCommand):
             {'username': 'host5', 'email': 'host5@example.com', 'first_name': 'David', 'last_name': 'Wilson'},
         ]
 
-        for host_info in host_data:
-            host, created = User.objects.get_or_create(
-                username=host_info['username'],
-                defaults={
-                    'email': host_info['email'],
-                    'first_name': host_info['first_name'],
-                    'last_name': host_info['last_name'],
-                }
-            )
-            if created:
-                host.set_password('password123')
-                host.save()
-                self.stdout.write(f'Created host: {host.username}')
-            hosts.append(host)
+        hosts, created = self._get_or_create_users(host_data)
+        for host in created:
+            self.stdout.write(f'Created host: {host.username}')
 
         return hosts
 
     def _create_listings(self, hosts, num_listings):
         """Create sample listings."""
-        cities_data = [
-            {'city': 'New York', 'country': 'United States'},
-            {'city': 'London', 'country': 'United Kingdom'},
-            {'city': 'Paris', 'country': 'France'},
-            {'city': 'Tokyo', 'country': 'Japan'},
-            {'city': 'Sydney', 'country': 'Australia'},
-            {'city': 'Dubai', 'country': 'United Arab Emirates'},
-            {'city': 'Barcelona', 'country': 'Spain'},
-            {'city': 'Rome', 'country': 'Italy'},
-            {'city': 'Bangkok', 'country': 'Thailand'},
-            {'city': 'Amsterdam', 'country': 'Netherlands'},
-            {'city': 'Berlin', 'country': 'Germany'},
-            {'city': 'Singapore', 'country': 'Singapore'},
-            {'city': 'Istanbul', 'country': 'Turkey'},
-            {'city': 'Cairo', 'country': 'Egypt'},
-            {'city': 'Cape Town', 'country': 'South Africa'},
+        # A fixed pool of amenity sets, reused across listings; never more
+        # sets than listings, so small runs don't sample more than before
+        amenities_variants = [
+            random.sample(_AMENITIES_POOL, min(random.randint(3, 8), len(_AMENITIES_POOL)))
+            for _ in range(min(128, num_listings))
         ]
 
-        property_types = [choice[0] for choice in Listing.PROPERTY_TYPES]
-        
-        amenities_pool = [
-            'WiFi', 'Air Conditioning', 'Heating', 'Kitchen', 'Washer', 'Dryer',
-            'TV', 'Parking', 'Pool', 'Gym', 'Hot Tub', 'Fireplace', 'Balcony',
-            'Garden', 'Beach Access', 'Mountain View', 'City View', 'Elevator',
-            'Security System', 'Pet Friendly', 'Smoking Allowed', 'Wheelchair Accessible'
-        ]
-
-        titles_templates = {
-            'apartment': [
-                'Cozy Apartment in {city}',
-                'Modern {city} Apartment',
-                'Stylish Downtown {city} Apartment',
-                'Luxury {city} Apartment',
-                'Spacious {city} Apartment',
-            ],
-            'house': [
-                'Beautiful House in {city}',
-                'Family-Friendly {city} House',
-                'Charming {city} Home',
-                'Elegant {city} House',
-                'Traditional {city} House',
-            ],
-            'hotel': [
-                'Grand {city} Hotel',
-                'Boutique {city} Hotel',
-                'Luxury {city} Hotel',
-                'Central {city} Hotel',
-                'Historic {city} Hotel',
-            ],
-            'villa': [
-                'Luxury Villa in {city}',
-                'Private {city} Villa',
-                'Beachfront {city} Villa',
-                'Modern {city} Villa',
-                'Elegant {city} Villa',
-            ],
-            'cottage': [
-                'Charming Cottage in {city}',
-                'Cozy {city} Cottage',
-                'Rustic {city} Cottage',
-                'Quaint {city} Cottage',
-                'Traditional {city} Cottage',
-            ],
-            'hostel': [
-                'Budget-Friendly {city} Hostel',
-                'Central {city} Hostel',
-                'Modern {city} Hostel',
-                'Social {city} Hostel',
-                'Clean {city} Hostel',
-            ],
-            'resort': [
-                'Luxury {city} Resort',
-                'Beach {city} Resort',
-                'All-Inclusive {city} Resort',
-                'Family {city} Resort',
-                'Boutique {city} Resort',
-            ],
-        }
-
-        descriptions = [
-            'A beautiful and well-maintained property perfect for your stay. Located in a prime area with easy access to local attractions.',
-            'Experience comfort and luxury in this stunning property. Fully equipped with modern amenities and excellent service.',
-            'Perfect for families and groups. This spacious property offers everything you need for a memorable vacation.',
-            'Located in the heart of the city, this property provides easy access to restaurants, shops, and cultural sites.',
-            'A peaceful retreat offering tranquility and relaxation. Ideal for those seeking a quiet getaway.',
-            'Modern design meets comfort in this exceptional property. Features top-of-the-line amenities and stunning views.',
-            'Historic charm with modern conveniences. This unique property offers a one-of-a-kind experience.',
-            'Beachfront property with breathtaking ocean views. Perfect for beach lovers and water sports enthusiasts.',
-            'Mountain view property surrounded by nature. Great for hiking, outdoor activities, and nature lovers.',
-            'Urban chic property in the city center. Close to nightlife, dining, and entertainment options.',
-        ]
+        # Draw the per-listing picks up front instead of once per iteration
+        picks = zip(
+            random.choices(_CITIES, k=num_listings),
+            random.choices(_PROPERTY_TYPES, k=num_listings),
+            random.choices(hosts, k=num_listings),
+            random.choices(_STREET_NAMES, k=num_listings),
+            random.choices(_DESCRIPTIONS, k=num_listings),
+            random.choices([True, True, True, False], k=num_listings),  # 75% available
+        )
 
         listings = []
-        for i in range(num_listings):
-            city_data = random.choice(cities_data)
-            property_type = random.choice(property_types)
-            host = random.choice(hosts)
-            
+        for city_data, property_type, host, street_name, description, is_available in picks:
             # Generate title
-            title_template = random.choice(titles_templates[property_type])
+            title_template = random.choice(_TITLES_TEMPLATES[property_type])
             title = title_template.format(city=city_data['city'])
             
             # Generate address
             street_number = random.randint(1, 9999)
-            street_names = ['Main St', 'Park Ave', 'Broadway', 'Ocean Dr', 'Mountain Rd', 'Garden Ln', 'Sunset Blvd']
-            address = f"{street_number} {random.choice(street_names)}"
+            address = f"{street_number} {street_name}"
             
             # Generate price based on property type
-            price_ranges = {
-                'hostel': (15, 50),
-                'apartment': (50, 200),
-                'house': (80, 300),
-                'cottage': (60, 250),
-                'hotel': (100, 400),
-                'villa': (200, 800),
-                'resort': (150, 600),
-            }
-            min_price, max_price = price_ranges.get(property_type, (50, 200))
-            price_per_night = Decimal(str(random.randint(min_price, max_price)))
+            min_price, max_price = _PRICE_RANGES.get(property_type, (50, 200))
+            price_per_night = Decimal(random.randint(min_price, max_price))
             
             # Generate property details
             if property_type in ['hostel']:
@@ -243,14 +315,10 @@ class Command(BaseCommand):
                 max_guests = random.randint(2, 8)
             
             # Generate amenities
-            num_amenities = random.randint(3, 8)
-            amenities = random.sample(amenities_pool, min(num_amenities, len(amenities_pool)))
-            
-            # Generate description
-            description = random.choice(descriptions)
+            amenities = random.choice(amenities_variants)
             
-            # Create listing
-            listing = Listing.objects.create(
+            # Build listing (inserted in bulk below)
+            listings.append(Listing(
                 host=host,
                 title=title,
                 description=description,
@@ -263,29 +331,28 @@ class Command(BaseCommand):
                 bedrooms=bedrooms,
                 bathrooms=bathrooms,
                 amenities=amenities,
-                is_available=random.choice([True, True, True, False]),  # 75% available
-            )
-            listings.append(listing)
+                is_available=is_available,
+            ))
 
-        return listings
+        # Bookings and reviews only need these columns from each listing
+        return self._bulk_create(
+            Listing, listings,
+            only=('id', 'price_per_night', 'max_guests', 'is_available'),
+        )
 
     def _create_bookings(self, listings, hosts):
         """Create sample bookings."""
         # Create guest users
-        guests = []
-        for i in range(1, 6):
-            guest, created = User.objects.get_or_create(
-                username=f'guest{i}',
-                defaults={
-                    'email': f'guest{i}@example.com',
-                    'first_name': f'Guest{i}',
-                    'last_name': 'User',
-                }
-            )
-            if created:
-                guest.set_password('password123')
-                guest.save()
-            guests.append(guest)
+        guest_data = [
+            {
+                'username': f'guest{i}',
+                'email': f'guest{i}@example.com',
+                'first_name': f'Guest{i}',
+                'last_name': 'User',
+            }
+            for i in range(1, 6)
+        ]
+        guests, _ = self._get_or_create_users(guest_data)
 
         bookings = []
         available_listings = [l for l in listings if l.is_available]
@@ -325,7 +392,7 @@ class Command(BaseCommand):
                 ]
                 special_requests = random.choice(requests)
             
-            booking = Booking.objects.create(
+            bookings.append(Booking(
                 listing=listing,
                 guest=guest,
                 check_in=check_in,
@@ -334,17 +401,16 @@ class Command(BaseCommand):
                 total_price=total_price,
                 status=status,
                 special_requests=special_requests,
-            )
-            bookings.append(booking)
+            ))
 
-        return bookings
+        return self._bulk_create(Booking, bookings)
 
     def _create_reviews(self, listings):
         """Create sample reviews."""
         # Get all users (hosts and guests)
-        all_users = User.objects.all()
+        all_users = list(User.objects.all())
         
-        if not all_users.exists():
+        if not all_users:
             self.stdout.write(self.style.WARNING('No users found to create reviews.'))
             return []
 
@@ -382,14 +448,24 @@ class Command(BaseCommand):
             ],
         }
 
+        # Completed bookings indexed by (guest_id, listing_id), fetched once
+        completed_bookings = defaultdict(list)
+        for b in Booking.objects.filter(status='completed').only('id', 'guest_id', 'listing_id'):
+            completed_bookings[(b.guest_id, b.listing_id)].append(b)
+
+        # (listing, user) pairs that already have a review, fetched once
+        seen = set(Review.objects.values_list('listing_id', 'user_id'))
+
         # Create reviews for random listings
         for _ in range(min(20, len(listings) * 2)):
             listing = random.choice(listings)
             user = random.choice(all_users)
             
-            # Check if user already reviewed this listing
-            if Review.objects.filter(listing=listing, user=user).exists():
+            # Skip if user already reviewed this listing
+            key = (listing.id, user.id)
+            if key in seen:
                 continue
+            seen.add(key)
             
             # Random rating
             rating = random.choices(
@@ -400,19 +476,17 @@ class Command(BaseCommand):
             comment = random.choice(ratings_comments[rating])
             
             # Try to associate with a booking if available
-            booking = None
-            user_bookings = Booking.objects.filter(guest=user, listing=listing, status='completed')
-            if user_bookings.exists():
-                booking = random.choice(user_bookings)
+            candidates = completed_bookings.get((user.id, listing.id))
+            booking = random.choice(candidates) if candidates else None
             
-            review = Review.objects.create(
+            reviews.append(Review(
                 listing=listing,
                 user=user,
                 booking=booking,
                 rating=rating,
                 comment=comment,
-            )
-            reviews.append(review)
+            ))
 
-        return reviews
+        # ignore_conflicts guards against reviews written concurrently
+        return self._bulk_create(Review, reviews, ignore_conflicts=True)
 
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-14 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['check_in'], name='listings_bo_check_i_da3308_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['created_at'], name='listings_li_created_740656_idx'),
+        ),
+    ]
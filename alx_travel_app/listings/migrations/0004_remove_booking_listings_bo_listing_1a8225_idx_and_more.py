@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-14 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0003_booking_listings_bo_check_i_da3308_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='listings_bo_listing_1a8225_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='listings_bo_guest_i_626ae5_idx',
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['listing', 'status', 'check_in', 'check_out'], name='listings_bo_listing_e7f266_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['guest', '-created_at'], name='listings_bo_guest_i_5f0fcf_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='listing',
+            name='listings_li_is_avai_3cf8dd_idx',
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['is_available', 'city', 'price_per_night'], name='listings_li_is_avai_0290bc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['is_available', '-created_at'], name='listings_li_is_avai_92994d_idx'),
+        ),
+    ]
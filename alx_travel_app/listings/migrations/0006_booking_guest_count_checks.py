@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-14 19:07
+
+from django.db import migrations, models
+
+
+# Reject bookings whose number_of_guests exceeds the listing's max_guests.
+# The check spans two tables, so it can't be a CheckConstraint. Updates are
+# only checked when number_of_guests or listing_id change, so older bookings
+# can still be saved (e.g. cancelled) after a host lowers max_guests.
+POSTGRESQL_CREATE = [
+    """
+    CREATE OR REPLACE FUNCTION listings_booking_check_guests() RETURNS trigger AS $$
+    BEGIN
+        -- save() writes every column, so UPDATE OF alone doesn't filter
+        IF TG_OP = 'UPDATE'
+            AND NEW.number_of_guests = OLD.number_of_guests
+            AND NEW.listing_id = OLD.listing_id THEN
+            RETURN NEW;
+        END IF;
+        IF NEW.number_of_guests > (
+            SELECT max_guests FROM listings_listing WHERE id = NEW.listing_id
+        ) THEN
+            RAISE EXCEPTION 'Number of guests exceeds the listing''s maximum guests.'
+                USING ERRCODE = '23514';
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER booking_guests_within_capacity
+    BEFORE INSERT OR UPDATE OF number_of_guests, listing_id ON listings_booking
+    FOR EACH ROW EXECUTE FUNCTION listings_booking_check_guests()
+    """,
+]
+
+POSTGRESQL_DROP = [
+    "DROP TRIGGER IF EXISTS booking_guests_within_capacity ON listings_booking",
+    "DROP FUNCTION IF EXISTS listings_booking_check_guests()",
+]
+
+MYSQL_TRIGGER_BODY = """
+    FOR EACH ROW
+    BEGIN
+        IF %sNEW.number_of_guests > (
+            SELECT max_guests FROM listings_listing WHERE id = NEW.listing_id
+        ) THEN
+            SIGNAL SQLSTATE '45000'
+                SET MESSAGE_TEXT = 'Number of guests exceeds the listing''s maximum guests.';
+        END IF;
+    END
+"""
+
+MYSQL_CREATE = [
+    "CREATE TRIGGER booking_guests_within_capacity_insert "
+    "BEFORE INSERT ON listings_booking" + MYSQL_TRIGGER_BODY % "",
+    # MySQL triggers have no column filter; compare OLD and NEW instead
+    "CREATE TRIGGER booking_guests_within_capacity_update "
+    "BEFORE UPDATE ON listings_booking" + MYSQL_TRIGGER_BODY % (
+        "(NEW.number_of_guests <> OLD.number_of_guests"
+        " OR NEW.listing_id <> OLD.listing_id) AND "
+    ),
+]
+
+MYSQL_DROP = [
+    "DROP TRIGGER IF EXISTS booking_guests_within_capacity_insert",
+    "DROP TRIGGER IF EXISTS booking_guests_within_capacity_update",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        # Other backends (e.g. SQLite in development) rely on Booking.clean()
+        # and the serializers' validation.
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0004_remove_booking_listings_bo_listing_1a8225_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.CheckConstraint(condition=models.Q(('number_of_guests__gte', 1)), name='booking_guests_positive'),
+        ),
+        migrations.RunPython(
+            _run({'postgresql': POSTGRESQL_CREATE, 'mysql': MYSQL_CREATE}),
+            _run({'postgresql': POSTGRESQL_DROP, 'mysql': MYSQL_DROP}),
+        ),
+    ]
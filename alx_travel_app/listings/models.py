@@ -76,7 +76,11 @@ class Listing(models.Model):
             models.Index(fields=['city', 'country']),
             models.Index(fields=['property_type']),
             models.Index(fields=['price_per_night']),
-            models.Index(fields=['is_available']),
+            models.Index(fields=['created_at']),
+            # Available-listing search: filter by city/price, newest first.
+            # These lead with is_available, so no separate boolean index.
+            models.Index(fields=['is_available', 'city', 'price_per_night']),
+            models.Index(fields=['is_available', '-created_at']),
         ]
 
     def __str__(self):
@@ -125,15 +129,22 @@ class Booking(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['listing', 'check_in', 'check_out']),
-            models.Index(fields=['guest']),
+            models.Index(fields=['listing', 'status', 'check_in', 'check_out']),
             models.Index(fields=['status']),
+            models.Index(fields=['check_in']),
+            models.Index(fields=['guest', '-created_at']),
         ]
         constraints = [
             models.CheckConstraint(
                 condition=Q(check_out__gt=F('check_in')),
                 name='check_out_after_check_in'
             ),
+            models.CheckConstraint(
+                condition=Q(number_of_guests__gte=1),
+                name='booking_guests_positive'
+            ),
+            # number_of_guests <= listing.max_guests spans two tables, so it
+            # is enforced by a database trigger (see migration 0006)
         ]
 
     def clean(self):
@@ -142,10 +153,13 @@ class Booking(models.Model):
         if self.check_out <= self.check_in:
             raise ValidationError('Check-out date must be after check-in date.')
 
-        if self.number_of_guests > self.listing.max_guests:
+        # self.listing is the cached instance the form/serializer assigned
+        # (or select_related loaded); read it once and skip if unset
+        listing = self.listing if self.listing_id is not None else None
+        if listing and self.number_of_guests > listing.max_guests:
             raise ValidationError(
                 f'Number of guests ({self.number_of_guests}) exceeds '
-                f'maximum allowed ({self.listing.max_guests}).'
+                f'maximum allowed ({listing.max_guests}).'
             )
 
     def __str__(self):
@@ -2,11 +2,30 @@ from rest_framework import serializers
 from .models import Listing, Booking, Payment
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.db import connections
 
 
 
 User = get_user_model()
 
+# Choice value -> label maps, built once instead of per get_FOO_display() call
+_PROPERTY_TYPE_DISPLAY = dict(Listing.PROPERTY_TYPES)
+_STATUS_DISPLAY = dict(Booking.STATUS_CHOICES)
+
+
+class ChoiceDisplayField(serializers.Field):
+    """Read-only field rendering a choice field's label from a prebuilt map."""
+
+    def __init__(self, display_map, **kwargs):
+        self.display_map = display_map
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        # Fall back to the raw value, as get_FOO_display() does
+        return self.display_map.get(value, value)
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for User model (used in nested relationships)."""
     password2 = serializers.CharField(write_only=True)
@@ -31,23 +50,23 @@ class UserSerializer(serializers.ModelSerializer):
 class ListingSerializer(serializers.ModelSerializer):
     """Serializer for Listing model."""
     
-    host = UserSerializer(read_only=True)
+    host_username = serializers.CharField(source='host.username', read_only=True)
     host_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
         source='host',
         write_only=True,
         required=True
     )
-    property_type_display = serializers.CharField(
-        source='get_property_type_display',
-        read_only=True
+    property_type_display = ChoiceDisplayField(
+        _PROPERTY_TYPE_DISPLAY,
+        source='property_type'
     )
     
     class Meta:
         model = Listing
         fields = [
             'id',
-            'host',
+            'host_username',
             'host_id',
             'title',
             'description',
@@ -84,10 +103,13 @@ class ListingListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for listing list views."""
     
     host_username = serializers.CharField(source='host.username', read_only=True)
-    property_type_display = serializers.CharField(
-        source='get_property_type_display',
-        read_only=True
+    property_type_display = ChoiceDisplayField(
+        _PROPERTY_TYPE_DISPLAY,
+        source='property_type'
     )
+    # Queryset annotations (ListingViewSet list); omitted when not annotated
+    avg_rating = serializers.FloatField(read_only=True)
+    review_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Listing
@@ -104,6 +126,8 @@ class ListingListSerializer(serializers.ModelSerializer):
             'bathrooms',
             'is_available',
             'host_username',
+            'avg_rating',
+            'review_count',
             'created_at',
         ]
         read_only_fields = ['id', 'created_at']
@@ -119,16 +143,16 @@ class BookingSerializer(serializers.ModelSerializer):
         write_only=True,
         required=True
     )
-    guest = UserSerializer(read_only=True)
+    guest_username = serializers.CharField(source='guest.username', read_only=True)
     guest_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
         source='guest',
         write_only=True,
         required=True
     )
-    status_display = serializers.CharField(
-        source='get_status_display',
-        read_only=True
+    status_display = ChoiceDisplayField(
+        _STATUS_DISPLAY,
+        source='status'
     )
     number_of_nights = serializers.SerializerMethodField()
     
@@ -138,7 +162,7 @@ class BookingSerializer(serializers.ModelSerializer):
             'id',
             'listing',
             'listing_id',
-            'guest',
+            'guest_username',
             'guest_id',
             'check_in',
             'check_out',
@@ -202,15 +226,99 @@ class BookingSerializer(serializers.ModelSerializer):
         return value
 
 
+class BookingListSerializer(serializers.ModelSerializer):
+    """Lightweight serializer for booking list views (no nested objects)."""
+    
+    class Meta:
+        model = Booking
+        fields = [
+            'id',
+            'listing_id',
+            'guest_id',
+            'check_in',
+            'check_out',
+            'status',
+            'total_price',
+        ]
+        read_only_fields = fields
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that first looks the pk up in a dict of objects
+    prefetched into the serializer context under context_key.
+
+    Falls back to the normal per-value query (and its error messages) when
+    nothing was prefetched or the pk isn't in the batch.
+    """
+
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def get_prefetch_key(self, data):
+        """
+        Return data as an in-range integer pk, or None when it has to go
+        through the normal lookup (and its type / does_not_exist errors).
+        """
+        if isinstance(data, bool):
+            return None
+        try:
+            pk = int(data)
+        except (TypeError, ValueError, OverflowError):
+            return None
+        queryset = self.get_queryset()
+        min_value, max_value = connections[queryset.db].ops.integer_field_range(
+            queryset.model._meta.pk.get_internal_type()
+        )
+        if not min_value <= pk <= max_value:
+            return None
+        return pk
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get(self.context_key)
+        if prefetched is not None:
+            pk = self.get_prefetch_key(data)
+            if pk in prefetched:
+                return prefetched[pk]
+        return super().to_internal_value(data)
+
+
+class BulkBookingListSerializer(serializers.ListSerializer):
+    """
+    List serializer for bulk booking creation that resolves every row's
+    listing_id and guest_id with one in_bulk() query each, instead of one
+    query per row.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            for field_name, context_key in (
+                ('listing_id', 'prefetched_listings'),
+                ('guest_id', 'prefetched_guests'),
+            ):
+                field = self.child.fields[field_name]
+                pks = {
+                    field.get_prefetch_key(item.get(field_name))
+                    for item in data
+                    if isinstance(item, dict)
+                }
+                pks.discard(None)
+                self.context[context_key] = field.get_queryset().in_bulk(pks)
+        return super().to_internal_value(data)
+
+
 class BookingCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating bookings (simplified, without nested objects)."""
     
-    listing_id = serializers.PrimaryKeyRelatedField(
+    listing_id = PrefetchedPrimaryKeyRelatedField(
+        'prefetched_listings',
         queryset=Listing.objects.filter(is_available=True),
         source='listing',
         required=True
     )
-    guest_id = serializers.PrimaryKeyRelatedField(
+    guest_id = PrefetchedPrimaryKeyRelatedField(
+        'prefetched_guests',
         queryset=User.objects.all(),
         source='guest',
         required=True
@@ -218,6 +326,7 @@ class BookingCreateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Booking
+        list_serializer_class = BulkBookingListSerializer
         fields = [
             'listing_id',
             'guest_id',
@@ -283,6 +392,20 @@ class PaymentSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'transaction_id', 'status', 'checkout_url', 'payment_initiated_at', 'payment_completed_at', 'created_at', 'updated_at']
+        # Uniqueness is checked in validate_booking instead
+        extra_kwargs = {'booking': {'validators': []}}
+
+    def validate_booking(self, value):
+        # Payment.booking is one-to-one, but a booking whose payment failed
+        # may be paid again; PaymentViewSet.create reuses the failed row
+        existing = Payment.objects.filter(booking=value)
+        if self.instance is not None:
+            existing = existing.exclude(pk=self.instance.pk)
+        else:
+            existing = existing.exclude(status='failed')
+        if existing.exists():
+            raise serializers.ValidationError('payment with this booking already exists.')
+        return value
 
 
 class ChapaPaymentInitSerializer(serializers.Serializer):
@@ -1,8 +1,9 @@
-import requests
+import httpx
 import logging
-import uuid
+import secrets
 from typing import Dict, Optional
 from dotenv import load_dotenv
+from django.core.cache import cache
 import os
 
 load_dotenv()
@@ -10,6 +11,31 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Shared by every payload that doesn't pass its own customization
+_DEFAULT_CUSTOMIZATION = {
+    "title": "ALX Travel Booking",
+    "description": "Payment for travel booking"
+}
+
+BANKS_CACHE_KEY = 'chapa:banks'
+BANKS_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+
+class ChapaError(Exception):
+    """A Chapa API call failed."""
+
+
+class ChapaTransientError(ChapaError):
+    """A Chapa call failed in a way a retry may fix (network error, timeout, 5xx)."""
+
+
+def _chapa_error(message: str, exc: Exception) -> ChapaError:
+    transient = isinstance(exc, httpx.TransportError) or (
+        isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code >= 500
+    )
+    error_class = ChapaTransientError if transient else ChapaError
+    return error_class(f"{message}: {str(exc)}")
+
 
 class ChapaService:
     """Service class for handling Chapa payment operations"""
@@ -21,10 +47,22 @@ class ChapaService:
             'Authorization': f'Bearer {self.secret_key}',
             'Content-Type': 'application/json'
         }
+        # Endpoints are fixed per instance; verify only varies by tx_ref
+        self.init_endpoint = f"{self.base_url}/transaction/initialize"
+        self.verify_endpoint_tpl = f"{self.base_url}/transaction/verify/%s"
+        self.banks_endpoint = f"{self.base_url}/banks"
+        # Pooled HTTP/2 client: one TLS connection multiplexes concurrent
+        # calls and reuses compressed headers
+        self.session = httpx.Client(
+            http2=True,
+            timeout=30,
+            headers=self.headers,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
     
     def generate_tx_ref(self) -> str:
         """Generate a unique transaction reference"""
-        return f"alx-travel-{uuid.uuid4().hex[:12]}"
+        return f"alx-travel-{secrets.token_hex(6)}"
     
     def initiate_payment(
         self,
@@ -57,8 +95,6 @@ class ChapaService:
         Returns:
             Dict containing payment initialization response
         """
-        endpoint = f"{self.base_url}/transaction/initialize"
-        
         payload = {
             "amount": str(amount),
             "currency": currency,
@@ -68,30 +104,19 @@ class ChapaService:
             "tx_ref": tx_ref,
             "callback_url": callback_url,
             "return_url": return_url,
-            "customization": {
-                "title": "ALX Travel Booking",
-                "description": "Payment for travel booking"
-            }
+            "customization": customization or _DEFAULT_CUSTOMIZATION
         }
         
         if phone_number:
             payload["phone_number"] = phone_number
         
-        if customization:
-            payload["customization"] = customization
-        
         try:
-            response = requests.post(
-                endpoint,
-                json=payload,
-                headers=self.headers,
-                timeout=30
-            )
+            response = self.session.post(self.init_endpoint, json=payload)
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Chapa payment initiation failed: {str(e)}")
-            raise Exception(f"Payment initiation failed: {str(e)}")
+            raise _chapa_error("Payment initiation failed", e) from e
     
     def verify_payment(self, tx_ref: str) -> Dict:
         """
@@ -103,32 +128,28 @@ class ChapaService:
         Returns:
             Dict containing payment verification response
         """
-        endpoint = f"{self.base_url}/transaction/verify/{tx_ref}"
-        
         try:
-            response = requests.get(
-                endpoint,
-                headers=self.headers,
-                timeout=30
-            )
+            response = self.session.get(self.verify_endpoint_tpl % tx_ref)
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Chapa payment verification failed: {str(e)}")
-            raise Exception(f"Payment verification failed: {str(e)}")
+            raise _chapa_error("Payment verification failed", e) from e
     
     def get_banks(self) -> Dict:
-        """Get list of available banks for direct bank transfers"""
-        endpoint = f"{self.base_url}/banks"
-        
+        """Get list of available banks for direct bank transfers (cached)"""
+        # The bank directory rarely changes, so serve it from the cache
+        return cache.get_or_set(BANKS_CACHE_KEY, self._fetch_banks, BANKS_CACHE_TIMEOUT)
+    
+    def _fetch_banks(self) -> Dict:
         try:
-            response = requests.get(
-                endpoint,
-                headers=self.headers,
-                timeout=30
-            )
+            response = self.session.get(self.banks_endpoint)
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Failed to fetch banks: {str(e)}")
-            raise Exception(f"Failed to fetch banks: {str(e)}")
+            raise _chapa_error("Failed to fetch banks", e) from e
+
+
+# Shared instance so the pooled client outlives individual requests
+chapa_service = ChapaService()
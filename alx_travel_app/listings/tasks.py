@@ -1,6 +1,8 @@
 from celery import shared_task
 from django.core.mail import send_mail
 from django.conf import settings
+from .models import Payment
+from .services.chapa_service import chapa_service, ChapaTransientError
 
 
 @shared_task
@@ -11,4 +13,39 @@ def send_booking_confirmation_email(user_email, booking_details):
     recipient_list = [user_email]
 
     send_mail(subject, message, from_email, recipient_list)
-    return f'Booking confirmation email sent to {user_email}.'
\ No newline at end of file
+    return f'Booking confirmation email sent to {user_email}.'
+
+
+@shared_task(bind=True, max_retries=3)
+def initiate_chapa_payment(self, payment_id, callback_url, return_url):
+    payment = Payment.objects.get(pk=payment_id)
+
+    try:
+        chapa_response = chapa_service.initiate_payment(
+            amount=str(payment.amount),
+            currency=payment.currency,
+            email=payment.email,
+            first_name=payment.first_name,
+            last_name=payment.last_name,
+            tx_ref=payment.chapa_reference,
+            callback_url=callback_url,
+            return_url=return_url,
+        )
+        # Inside the try so a 2xx body without a checkout_url still marks
+        # the payment failed instead of leaving it pending
+        checkout_url = (chapa_response.get("data") or {}).get("checkout_url")
+        if not checkout_url:
+            raise Exception(f"Chapa response has no checkout_url: {chapa_response}")
+    except Exception as e:
+        # Network errors, timeouts and 5xx responses are retried with backoff
+        # before the payment is marked failed
+        if isinstance(e, ChapaTransientError) and self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=30 * 2 ** self.request.retries)
+        payment.status = 'failed'
+        payment.failure_reason = str(e)
+        payment.save(update_fields=['status', 'failure_reason', 'updated_at'])
+        return f'Payment initiation failed for {payment.chapa_reference}.'
+
+    payment.checkout_url = checkout_url
+    payment.save(update_fields=['checkout_url', 'updated_at'])
+    return f'Payment initiated for {payment.chapa_reference}.'
@@ -1,3 +1,439 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+import httpx
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .models import Listing, Booking, Review, Payment
+from .serializers import BookingCreateSerializer
+from .services.chapa_service import ChapaService, chapa_service, ChapaError, ChapaTransientError
+from .tasks import initiate_chapa_payment
+
+User = get_user_model()
+
+
+def make_listing(host, **kwargs):
+    fields = {
+        'title': 'Cozy Apartment in Paris',
+        'description': 'A test listing.',
+        'address': '1 Main St',
+        'city': 'Paris',
+        'country': 'France',
+        'property_type': 'apartment',
+        'price_per_night': Decimal('100.00'),
+        'max_guests': 4,
+    }
+    fields.update(kwargs)
+    return Listing.objects.create(host=host, **fields)
+
+
+def make_booking(listing, guest, **kwargs):
+    fields = {
+        'check_in': date(2027, 1, 1),
+        'check_out': date(2027, 1, 4),
+        'number_of_guests': 2,
+        'total_price': Decimal('300.00'),
+    }
+    fields.update(kwargs)
+    return Booking.objects.create(listing=listing, guest=guest, **fields)
+
+
+class BookingCreateTests(APITestCase):
+    """POST /bookings/ saves the booking and queues the confirmation email."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.host = User.objects.create_user('host', 'host@example.com', 'pw', role='host')
+        cls.guest = User.objects.create_user('guest', 'guest@example.com', 'pw')
+        cls.listing = make_listing(cls.host)
+
+    def payload(self, **kwargs):
+        data = {
+            'listing_id': self.listing.id,
+            'guest_id': self.guest.id,
+            'check_in': '2027-01-01',
+            'check_out': '2027-01-04',
+            'number_of_guests': 2,
+            'total_price': '300.00',
+        }
+        data.update(kwargs)
+        return data
+
+    @mock.patch('alx_travel_app.listings.views.send_booking_confirmation_email.delay')
+    def test_create_sends_confirmation_email(self, delay):
+        response = self.client.post(reverse('booking-list'), self.payload(), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        booking = Booking.objects.get()
+        self.assertEqual(response.data['id'], booking.id)
+        self.assertEqual(response.data['guest_username'], 'guest')
+        self.assertEqual(response.data['number_of_nights'], 3)
+
+        delay.assert_called_once()
+        kwargs = delay.call_args.kwargs
+        self.assertEqual(kwargs['user_email'], 'guest@example.com')
+        self.assertIn('Listing: Cozy Apartment in Paris', kwargs['booking_details'])
+        self.assertIn('Total Price: 300.00', kwargs['booking_details'])
+
+    @mock.patch('alx_travel_app.listings.views.send_booking_confirmation_email.delay')
+    def test_create_rejects_too_many_guests(self, delay):
+        response = self.client.post(
+            reverse('booking-list'), self.payload(number_of_guests=5), format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('number_of_guests', response.data)
+        self.assertFalse(Booking.objects.exists())
+        delay.assert_not_called()
+
+    def test_update_reports_new_number_of_nights(self):
+        booking = make_booking(self.listing, self.guest)
+
+        response = self.client.patch(
+            reverse('booking-detail', args=[booking.id]),
+            {'check_out': '2027-01-10'},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['number_of_nights'], 9)
+
+
+class BulkBookingCreateTests(APITestCase):
+    """POST /bookings/ with a JSON list creates all bookings or none."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.host = User.objects.create_user('host', 'host@example.com', 'pw', role='host')
+        cls.guests = [
+            User.objects.create_user(f'guest{i}', f'guest{i}@example.com', 'pw')
+            for i in range(3)
+        ]
+        cls.listing = make_listing(cls.host)
+
+    def row(self, guest, **kwargs):
+        data = {
+            'listing_id': self.listing.id,
+            'guest_id': guest.id,
+            'check_in': '2027-01-01',
+            'check_out': '2027-01-04',
+            'number_of_guests': 2,
+            'total_price': '300.00',
+        }
+        data.update(kwargs)
+        return data
+
+    @mock.patch('alx_travel_app.listings.views.send_booking_confirmation_email.delay')
+    def test_bulk_create(self, delay):
+        rows = [self.row(guest) for guest in self.guests]
+
+        response = self.client.post(reverse('booking-list'), rows, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(
+            sorted(row['guest_id'] for row in response.data),
+            sorted(guest.id for guest in self.guests)
+        )
+        self.assertEqual(Booking.objects.count(), 3)
+        self.assertEqual(
+            sorted(call.kwargs['user_email'] for call in delay.call_args_list),
+            ['guest0@example.com', 'guest1@example.com', 'guest2@example.com']
+        )
+
+    def test_validation_resolves_related_rows_in_two_queries(self):
+        rows = [self.row(guest) for guest in self.guests]
+        serializer = BookingCreateSerializer(data=rows, many=True)
+
+        with self.assertNumQueries(2):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    @mock.patch('alx_travel_app.listings.views.send_booking_confirmation_email.delay')
+    def test_invalid_row_rejects_whole_batch(self, delay):
+        rows = [self.row(self.guests[0]), self.row(self.guests[1], number_of_guests=5)]
+
+        response = self.client.post(reverse('booking-list'), rows, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('number_of_guests', response.data[1])
+        self.assertFalse(Booking.objects.exists())
+        delay.assert_not_called()
+
+    def test_errors_match_single_object_validation(self):
+        unavailable = make_listing(self.host, is_available=False)
+        cases = [
+            ('guest_id', True, 'incorrect_type'),
+            ('guest_id', 'abc', 'incorrect_type'),
+            ('guest_id', 10 ** 30, 'does_not_exist'),
+            ('listing_id', 999999, 'does_not_exist'),
+            ('listing_id', unavailable.id, 'does_not_exist'),
+        ]
+        for field, value, code in cases:
+            with self.subTest(field=field, value=value):
+                bad_row = self.row(self.guests[1], **{field: value})
+
+                single = BookingCreateSerializer(data=bad_row)
+                self.assertFalse(single.is_valid())
+                bulk = BookingCreateSerializer(data=[self.row(self.guests[0]), bad_row], many=True)
+                self.assertFalse(bulk.is_valid())
+
+                self.assertEqual(single.errors[field][0].code, code)
+                self.assertEqual(bulk.errors[1][field], single.errors[field])
+
+
+class ListEndpointQueryTests(APITestCase):
+    """List endpoints stay at one query regardless of the number of rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        host = User.objects.create_user('host', 'host@example.com', 'pw', role='host')
+        guests = [
+            User.objects.create_user(f'guest{i}', f'guest{i}@example.com', 'pw')
+            for i in range(3)
+        ]
+        for i in range(3):
+            listing = make_listing(host, title=f'Listing {i}')
+            for guest in guests:
+                make_booking(listing, guest)
+                Review.objects.create(listing=listing, user=guest, rating=i + 2)
+
+    def test_listing_list(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('listing-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+        rows = {row['title']: row for row in response.data}
+        self.assertEqual(rows['Listing 1']['avg_rating'], 3.0)
+        self.assertEqual(rows['Listing 1']['review_count'], 3)
+        self.assertEqual(rows['Listing 1']['host_username'], 'host')
+
+    def test_booking_list(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('booking-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 9)
+
+
+class PaymentTests(APITestCase):
+    """Payments are created pending and initiated with Chapa in Celery."""
+
+    @classmethod
+    def setUpTestData(cls):
+        host = User.objects.create_user('host', 'host@example.com', 'pw', role='host')
+        guest = User.objects.create_user('guest', 'guest@example.com', 'pw')
+        cls.booking = make_booking(make_listing(host), guest)
+
+    def payload(self, **kwargs):
+        data = {
+            'booking': self.booking.id,
+            'chapa_reference': 'client-ref',
+            'amount': '300.00',
+            'first_name': 'Ada',
+            'last_name': 'Guest',
+            'email': 'guest@example.com',
+        }
+        data.update(kwargs)
+        return data
+
+    def make_payment(self, **kwargs):
+        fields = {
+            'booking': self.booking,
+            'transaction_id': 'alx-travel-test',
+            'chapa_reference': 'alx-travel-test',
+            'amount': Decimal('300.00'),
+            'currency': 'ETB',
+            'first_name': 'Ada',
+            'last_name': 'Guest',
+            'email': 'guest@example.com',
+        }
+        fields.update(kwargs)
+        return Payment.objects.create(**fields)
+
+    def initiate(self, payment):
+        # apply() runs the task eagerly, including its retries
+        return initiate_chapa_payment.apply(
+            args=(payment.id,),
+            kwargs={
+                'callback_url': 'https://example.com/callback/',
+                'return_url': 'https://example.com/return/',
+            },
+        )
+
+    @mock.patch('alx_travel_app.listings.views.initiate_chapa_payment.delay')
+    def test_create_queues_initiation(self, delay):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(reverse('payment-list'), self.payload(), format='json')
+            # Queued on commit, not while the row is still uncommitted
+            delay.assert_not_called()
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        payment = Payment.objects.get()
+        self.assertEqual(response.data['status'], 'pending')
+        self.assertIsNone(response.data['checkout_url'])
+        self.assertEqual(payment.currency, 'ETB')
+        self.assertTrue(payment.chapa_reference.startswith('alx-travel-'))
+        delay.assert_called_once_with(
+            payment.id,
+            callback_url=mock.ANY,
+            return_url=mock.ANY,
+        )
+
+    def test_task_stores_checkout_url(self):
+        payment = self.make_payment()
+        response = {'status': 'success', 'data': {'checkout_url': 'https://checkout.chapa.co/x'}}
+
+        with mock.patch.object(chapa_service, 'initiate_payment', return_value=response) as initiate:
+            self.initiate(payment)
+
+        self.assertEqual(initiate.call_args.kwargs['tx_ref'], 'alx-travel-test')
+        self.assertEqual(initiate.call_args.kwargs['amount'], '300.00')
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, 'pending')
+        self.assertEqual(payment.checkout_url, 'https://checkout.chapa.co/x')
+
+    def test_task_marks_payment_failed_on_chapa_error(self):
+        payment = self.make_payment()
+
+        with mock.patch.object(
+            chapa_service, 'initiate_payment',
+            side_effect=Exception('Payment initiation failed: 400 Bad Request')
+        ):
+            self.initiate(payment)
+
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, 'failed')
+        self.assertEqual(payment.failure_reason, 'Payment initiation failed: 400 Bad Request')
+        self.assertIsNone(payment.checkout_url)
+
+    def test_task_marks_payment_failed_without_checkout_url(self):
+        payment = self.make_payment()
+
+        with mock.patch.object(
+            chapa_service, 'initiate_payment',
+            return_value={'status': 'success', 'data': None}
+        ):
+            self.initiate(payment)
+
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, 'failed')
+        self.assertIn('no checkout_url', payment.failure_reason)
+
+    @mock.patch('alx_travel_app.listings.views.initiate_chapa_payment.delay')
+    def test_create_reuses_failed_payment(self, delay):
+        failed = self.make_payment(status='failed', failure_reason='Payment initiation failed')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('payment-list'), self.payload(), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['id'], failed.id)
+        payment = Payment.objects.get()
+        self.assertEqual(payment.status, 'pending')
+        self.assertIsNone(payment.failure_reason)
+        self.assertNotEqual(payment.chapa_reference, 'alx-travel-test')
+        delay.assert_called_once_with(payment.id, callback_url=mock.ANY, return_url=mock.ANY)
+
+    @mock.patch('alx_travel_app.listings.views.initiate_chapa_payment.delay')
+    def test_create_rejects_booking_with_active_payment(self, delay):
+        self.make_payment()
+
+        response = self.client.post(reverse('payment-list'), self.payload(), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['booking'], ['payment with this booking already exists.'])
+        delay.assert_not_called()
+
+    @mock.patch(
+        'alx_travel_app.listings.views.initiate_chapa_payment.delay',
+        side_effect=OSError('Connection refused')
+    )
+    def test_create_fails_payment_when_queueing_fails(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('payment-list'), self.payload(), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        payment = Payment.objects.get()
+        self.assertEqual(payment.status, 'failed')
+        self.assertIn('Connection refused', payment.failure_reason)
+
+    def test_task_retries_transient_errors(self):
+        payment = self.make_payment()
+        response = {'status': 'success', 'data': {'checkout_url': 'https://checkout.chapa.co/x'}}
+
+        with mock.patch.object(
+            chapa_service, 'initiate_payment',
+            side_effect=[ChapaTransientError('Payment initiation failed: timed out'), response]
+        ) as initiate:
+            self.initiate(payment)
+
+        self.assertEqual(initiate.call_count, 2)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, 'pending')
+        self.assertEqual(payment.checkout_url, 'https://checkout.chapa.co/x')
+
+    def test_task_fails_payment_after_last_retry(self):
+        payment = self.make_payment()
+
+        with mock.patch.object(
+            chapa_service, 'initiate_payment',
+            side_effect=ChapaTransientError('Payment initiation failed: timed out')
+        ) as initiate:
+            self.initiate(payment)
+
+        self.assertEqual(initiate.call_count, initiate_chapa_payment.max_retries + 1)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, 'failed')
+        self.assertEqual(payment.failure_reason, 'Payment initiation failed: timed out')
+
+    def test_task_does_not_retry_client_errors(self):
+        payment = self.make_payment()
+
+        with mock.patch.object(
+            chapa_service, 'initiate_payment',
+            side_effect=ChapaError('Payment initiation failed: 400 Bad Request')
+        ) as initiate:
+            self.initiate(payment)
+
+        self.assertEqual(initiate.call_count, 1)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, 'failed')
+
+
+class ChapaServiceErrorTests(SimpleTestCase):
+    """ChapaService wraps failures and flags the retryable ones."""
+
+    def service(self, handler):
+        service = ChapaService()
+        service.session = httpx.Client(transport=httpx.MockTransport(handler))
+        # Independent of CHAPA_BASE_URL in the environment
+        service.verify_endpoint_tpl = 'https://api.chapa.test/v1/transaction/verify/%s'
+        return service
+
+    def test_server_errors_and_timeouts_are_transient(self):
+        def timeout(request):
+            raise httpx.ConnectTimeout('timed out', request=request)
+
+        for handler in (lambda request: httpx.Response(503), timeout):
+            with self.subTest(handler=handler):
+                with self.assertRaises(ChapaTransientError):
+                    self.service(handler).verify_payment('tx-1')
+
+    def test_client_errors_and_bad_json_are_not_transient(self):
+        handlers = (
+            lambda request: httpx.Response(400, json={'message': 'Invalid'}),
+            lambda request: httpx.Response(200, text='<html>'),
+        )
+        for handler in handlers:
+            with self.subTest(handler=handler):
+                with self.assertRaises(ChapaError) as caught:
+                    self.service(handler).verify_payment('tx-1')
+                self.assertNotIsInstance(caught.exception, ChapaTransientError)
+                self.assertTrue(str(caught.exception).startswith('Payment verification failed: '))
@@ -1,38 +1,146 @@
 from django.shortcuts import render
 from rest_framework.viewsets import ModelViewSet
 from .models import Listing, Booking, Payment
-from .serializers import ListingSerializer, BookingSerializer, PaymentSerializer, UserSerializer
+from .serializers import (
+    ListingSerializer,
+    ListingListSerializer,
+    BookingSerializer,
+    BookingListSerializer,
+    BookingCreateSerializer,
+    PaymentSerializer,
+    UserSerializer,
+)
 from rest_framework.response import Response
 from rest_framework import status
-from .services.chapa_service import ChapaService
+from .services.chapa_service import chapa_service
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Avg, Count
 from rest_framework.decorators import api_view
-from .tasks import send_booking_confirmation_email
+from .tasks import send_booking_confirmation_email, initiate_chapa_payment
 
 User = get_user_model()
 
 
 # Create your views here.
+class EagerLoadingMixin:
+    """
+    Apply a viewset's declared select_related / prefetch_related lookups
+    to its queryset, so nested serializers don't query once per row.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    def get_select_related_fields(self):
+        return self.select_related_fields
+
+    def get_prefetch_related_fields(self):
+        return self.prefetch_related_fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select_related_fields = self.get_select_related_fields()
+        if select_related_fields:
+            queryset = queryset.select_related(*select_related_fields)
+        prefetch_related_fields = self.get_prefetch_related_fields()
+        if prefetch_related_fields:
+            queryset = queryset.prefetch_related(*prefetch_related_fields)
+        return queryset
+
+
 class UserViewSet(ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
 
 
-class ListingViewSet(ModelViewSet):
+class ListingViewSet(EagerLoadingMixin, ModelViewSet):
     queryset = Listing.objects.all()
     serializer_class = ListingSerializer
-
-
-class BookingViewSet(ModelViewSet):
+    select_related_fields = ('host',)
+    # Columns ListingListSerializer reads; skips description and amenities
+    list_only_fields = (
+        'id', 'title', 'city', 'country', 'property_type', 'price_per_night',
+        'max_guests', 'bedrooms', 'bathrooms', 'is_available', 'created_at',
+        'host__username',
+    )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Ratings aggregated in one GROUP BY (served by the
+            # (listing, rating) review index) rather than a query per
+            # listing. Meta.ordering isn't applied to GROUP BY queries.
+            queryset = queryset.only(*self.list_only_fields).annotate(
+                avg_rating=Avg('reviews__rating'),
+                review_count=Count('reviews'),
+            ).order_by(*Listing._meta.ordering)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ListingListSerializer
+        return super().get_serializer_class()
+
+
+class BookingViewSet(EagerLoadingMixin, ModelViewSet):
     queryset = Booking.objects.all()
     serializer_class = BookingSerializer
+    select_related_fields = ('guest', 'listing__host')
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return BookingListSerializer
+        return super().get_serializer_class()
 
+    def get_select_related_fields(self):
+        # BookingListSerializer only reads the foreign key ids
+        if self.action == 'list':
+            return ()
+        return super().get_select_related_fields()
 
     def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        booking = serilizer.save()
+        # save() returns the instance with the listing/guest objects the
+        # serializer validated already attached, so no extra queries below
+        booking = serializer.save()
+        self.send_confirmation_email(booking)
+
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED,
+            headers=headers
+        )
+
+    def bulk_create(self, request):
+        """
+        Create every booking in a JSON list, or none of them. The list
+        serializer resolves all rows' listing_id / guest_id values with one
+        query each instead of one per row.
+        """
+        serializer = BookingCreateSerializer(
+            data=request.data,
+            many=True,
+            context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            bookings = serializer.save()
+        for booking in bookings:
+            self.send_confirmation_email(booking)
 
+        return Response(
+            BookingListSerializer(bookings, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    def send_confirmation_email(self, booking):
         booking_details = f"""
             Listing: {booking.listing.title}
             Check-in: {booking.check_in}
@@ -43,15 +151,8 @@ class BookingViewSet(ModelViewSet):
 
         # Send booking confirmation email asynchronously
         send_booking_confirmation_email.delay(
-            user_email=booking.user.email,
-            booking_details=str(booking)
-        )
-
-        headers = self.get_success_headers(serializer.data)
-        return Response(
-            serializer.data,
-            status=status.HTTP_201_CREATED,
-            headers=headers
+            user_email=booking.guest.email,
+            booking_details=booking_details
         )
 
 class PaymentViewSet(ModelViewSet):
@@ -63,45 +164,54 @@ class PaymentViewSet(ModelViewSet):
         serializer.is_valid(raise_exception=True)
 
         data = serializer.validated_data
-        chapa_service = ChapaService()
         tx_ref = chapa_service.generate_tx_ref()
 
-        try:
-            chapa_response = chapa_service.initiate_payment(
-                amount=str(data['amount']),
-                currency="ETB",  # MUST be ETB or USD
-                email=data['email'],
-                first_name=data['first_name'],
-                last_name=data['last_name'],
-                tx_ref=tx_ref,
-                callback_url="http://127.0.0.1:8000/api/payments/callback/",
-                return_url="http://127.0.0.1:8000/payment/return/",
-            )
-        except Exception as e:
-            return Response(
-                {"error": str(e)},
-                status=status.HTTP_400_BAD_REQUEST
+        # The payment starts as pending without a checkout_url; the Chapa
+        # call runs in Celery and fills it in (or marks the payment failed).
+        # Clients poll GET /payments/{id}/ for the checkout_url.
+        with transaction.atomic():
+            # Payment.booking is one-to-one: a booking whose earlier payment
+            # failed is retried on that row (PaymentSerializer rejects any
+            # other existing payment)
+            payment, _ = Payment.objects.filter(status='failed').update_or_create(
+                booking=data['booking'],
+                defaults={
+                    'transaction_id': tx_ref,
+                    'chapa_reference': tx_ref,
+                    'checkout_url': None,
+                    'amount': data['amount'],
+                    'currency': "ETB",  # MUST be ETB or USD
+                    'first_name': data['first_name'],
+                    'last_name': data['last_name'],
+                    'email': data['email'],
+                    'phone_number': data.get('phone_number'),
+                    'status': "pending",
+                    'failure_reason': None,
+                    'payment_initiated_at': timezone.now(),
+                }
             )
-
-        payment = Payment.objects.create(
-            booking=data['booking'],
-            transaction_id=tx_ref,
-            chapa_reference=tx_ref,
-            checkout_url=chapa_response["data"]["checkout_url"],
-            amount=data['amount'],
-            currency="ETB",
-            first_name=data['first_name'],
-            last_name=data['last_name'],
-            email=data['email'],
-            phone_number=data.get('phone_number'),
-            status="pending"
-        )
+            # Queue only once the row is committed, so the worker can read it
+            transaction.on_commit(lambda: self.queue_initiation(payment))
 
         return Response(
             self.get_serializer(payment).data,
-            status=status.HTTP_201_CREATED
+            status=status.HTTP_202_ACCEPTED
         )
 
+    def queue_initiation(self, payment):
+        try:
+            initiate_chapa_payment.delay(
+                payment.id,
+                callback_url=settings.CHAPA_CALLBACK_URL,
+                return_url=settings.CHAPA_RETURN_URL,
+            )
+        except Exception as e:
+            # e.g. the broker is down; nothing would ever pick the payment
+            # up, so fail it and let the client POST again
+            payment.status = 'failed'
+            payment.failure_reason = f'Could not queue payment initiation: {str(e)}'
+            payment.save(update_fields=['status', 'failure_reason', 'updated_at'])
+
 @api_view(['GET'])
 def payment_return(request):
     return Response({
@@ -55,6 +55,13 @@ INSTALLED_APPS = [
     'alx_travel_app.listings'
 ]
 
+# Rows per INSERT statement used by the seed command's bulk_create calls
+SEED_BULK_BATCH_SIZE = env.int('SEED_BULK_BATCH_SIZE', default=500)
+
+# URLs handed to Chapa when initiating a payment
+CHAPA_CALLBACK_URL = env('CHAPA_CALLBACK_URL', default='http://127.0.0.1:8000/api/payments/callback/')
+CHAPA_RETURN_URL = env('CHAPA_RETURN_URL', default='http://127.0.0.1:8000/payment/return/')
+
 CELERY_BROKER_URL = 'amqp://localhost'  # default RabbitMQ broker
 CELERY_RESULT_BACKEND = 'rpc://'
 